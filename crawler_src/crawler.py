@@ -18,6 +18,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 
 from exceptions import *
+from screenshots import ScreenshotEngine
 from utils import *
 
 
@@ -29,12 +30,24 @@ class Crawler:
         output_dir="crawl_data",
         pageload_timeout=30,
         js_load_wait=5,
+        screenshot_format="png",
+        screenshot_quality=None,
+        screenshot_clip=None,
+        screenshot_scale=1,
+        skip_unchanged_screenshots=False,
+        unchanged_screenshot_threshold=1.0,
     ):
         """
         Initializes the crawler.
         :param headless: run the browser headless or not
         :param mobile: run the browser as mobile device
         :param output_dir: folder to put the output files
+        :param screenshot_format: png, jpeg or webp
+        :param screenshot_quality: compression quality (0-100) for jpeg and webp screenshots
+        :param screenshot_clip: (x, y, width, height) region to capture, or None for the viewport
+        :param screenshot_scale: factor to downscale screenshots with
+        :param skip_unchanged_screenshots: don't save the post consent screenshot if it looks unchanged
+        :param unchanged_screenshot_threshold: max mean gray level difference to consider screenshots unchanged
         """
         self.driver = None
         self.timeout = pageload_timeout
@@ -44,6 +57,16 @@ class Crawler:
         self.mobile = mobile
         self.output_dir = output_dir
 
+        self.screenshots = ScreenshotEngine(
+            output_dir,
+            image_format=screenshot_format,
+            quality=screenshot_quality,
+            clip=screenshot_clip,
+            scale=screenshot_scale,
+            skip_unchanged=skip_unchanged_screenshots,
+            unchanged_threshold=unchanged_screenshot_threshold,
+        )
+
         self.__init_consent_accept_words_list()
         self.__init_fingerprint_canvas()
 
@@ -169,11 +192,9 @@ class Crawler:
         :param post_consent: Pre or post accepting cookies
         """
         filename = (
-            f"{self.output_file_prefix}_{'post' if post_consent else 'pre'}_consent.png"
+            f"{self.output_file_prefix}_{'post' if post_consent else 'pre'}_consent"
         )
-        filename = path.join(self.output_dir, filename)
-
-        self.driver.save_screenshot(filename)
+        self.screenshots.capture(self.driver, filename, post_consent=post_consent)
 
     def _create_json(self, output):
         """
@@ -350,12 +371,19 @@ class Crawler:
         canvas_image_data = self._capture_fingerprint_canvas_images()
         requests = self._get_requests()
         cookies = self.driver.get_cookies()
+        screenshot_data = self.screenshots.collect()
+        logging.info(
+            f"Screenshots of {self.current_url}: "
+            f"{sum(s['capture_time'] for s in screenshot_data):.3f}s, "
+            f"{sum(s['bytes'] for s in screenshot_data)} bytes"
+        )
 
         return (
             post_pageload_url,
             requests,
             cookies,
             canvas_image_data,
+            screenshot_data,
             consent_clicked,
             consent_failure,
         )
@@ -397,6 +425,7 @@ class Crawler:
                 "load_time": None,
                 "cookies": None,
                 "canvas_image_data": None,
+                "screenshot_data": None,
                 "failure_status": {
                     "timeout": True,
                     "TLS": None,
@@ -419,6 +448,7 @@ class Crawler:
             requests,
             cookies,
             canvas_image_data,
+            screenshot_data,
             consent_clicked,
             consent_failure,
         ) = self._handle_page()
@@ -449,6 +479,7 @@ class Crawler:
             "load_time": end_time - start_time,
             "cookies": cookies,
             "canvas_image_data": canvas_image_data,
+            "screenshot_data": screenshot_data,
             "consent_clicked": consent_clicked,
             "failure_status": {
                 "timeout": False,
@@ -460,6 +491,7 @@ class Crawler:
         self.reset_driver()
 
     def restart_driver(self):
+        self.screenshots.collect()  # drop screenshots left over from a crashed crawl
         self.driver.quit()
         time.sleep(10)
         self.start_driver()
@@ -498,4 +530,5 @@ class Crawler:
         self._crawl_urls(urls)
 
     def __delete__(self, instance):
+        self.screenshots.shutdown()
         self.driver.quit()
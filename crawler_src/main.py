@@ -29,6 +29,37 @@ def parse_args():
     )
     parser.add_argument("-i", help="path to CSV with domains to crawl")
     parser.add_argument("-H", help="headless or headful (default is headless)")
+    parser.add_argument(
+        "--screenshot-format",
+        default="png",
+        help="png, jpeg or webp (default is png)",
+    )
+    parser.add_argument(
+        "--screenshot-quality",
+        type=int,
+        help="compression quality (0-100), only for jpeg and webp screenshots",
+    )
+    parser.add_argument(
+        "--screenshot-clip",
+        help="region to capture as x,y,width,height (default is the viewport)",
+    )
+    parser.add_argument(
+        "--screenshot-scale",
+        type=float,
+        default=1,
+        help="factor to downscale screenshots with (default is 1)",
+    )
+    parser.add_argument(
+        "--skip-unchanged-screenshots",
+        action="store_true",
+        help="don't save the post consent screenshot if the page looks unchanged",
+    )
+    parser.add_argument(
+        "--unchanged-screenshot-threshold",
+        type=float,
+        default=1.0,
+        help="max mean gray level difference (0-255) to consider screenshots unchanged (default is 1.0)",
+    )
 
     args = parser.parse_args()
 
@@ -38,6 +69,20 @@ def parse_args():
     if args.H:
         assert args.H == "headless" or args.H == "headful"
 
+    assert args.screenshot_format in ("png", "jpeg", "webp")
+
+    if args.screenshot_quality is not None:
+        assert args.screenshot_format != "png"
+        assert 0 <= args.screenshot_quality <= 100
+
+    if args.screenshot_clip:
+        args.screenshot_clip = tuple(float(v) for v in args.screenshot_clip.split(","))
+        assert len(args.screenshot_clip) == 4
+
+    assert 0 < args.screenshot_scale <= 1
+
+    assert 0 <= args.unchanged_screenshot_threshold <= 255
+
     return args
 
 
@@ -47,7 +92,15 @@ def main():
     mobile = bool(args.m and args.m == "mobile")
 
     crawler = Crawler(
-        headless=headless, mobile=mobile, output_dir=os.path.abspath(DATA_PATH)
+        headless=headless,
+        mobile=mobile,
+        output_dir=os.path.abspath(DATA_PATH),
+        screenshot_format=args.screenshot_format,
+        screenshot_quality=args.screenshot_quality,
+        screenshot_clip=args.screenshot_clip,
+        screenshot_scale=args.screenshot_scale,
+        skip_unchanged_screenshots=args.skip_unchanged_screenshots,
+        unchanged_screenshot_threshold=args.unchanged_screenshot_threshold,
     )
 
     if args.u:
@@ -0,0 +1,184 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import io
+import logging
+from os import path
+import time
+
+from PIL import Image
+
+SCREENSHOT_FORMATS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+def grayscale_thumbnail(image_data, size=32):
+    """
+    Downscale an image to a small grayscale thumbnail for comparison.
+    :param image_data: the encoded image bytes
+    :param size: width and height of the thumbnail
+    :return: the thumbnail pixel values (0-255), row by row
+    """
+    with Image.open(io.BytesIO(image_data)) as image:
+        return list(image.convert("L").resize((size, size)).getdata())
+
+
+def mean_pixel_difference(pixels_a, pixels_b):
+    """
+    Compute the mean absolute difference between two equally sized thumbnails.
+    :return: the mean difference in gray levels (0-255)
+    """
+    return sum(abs(a - b) for a, b in zip(pixels_a, pixels_b)) / len(pixels_a)
+
+
+class ScreenshotEngine:
+    def __init__(
+        self,
+        output_dir,
+        image_format="png",
+        quality=None,
+        clip=None,
+        scale=1,
+        skip_unchanged=False,
+        unchanged_threshold=1.0,
+    ):
+        """
+        Initializes the screenshot engine.
+        :param output_dir: folder to put the screenshots
+        :param image_format: png, jpeg or webp
+        :param quality: compression quality (0-100), only used for jpeg and webp
+        :param clip: (x, y, width, height) of the region to capture, or None for the viewport
+        :param scale: factor to downscale the screenshot with
+        :param skip_unchanged: skip the post consent screenshot if it looks like the pre consent one
+        :param unchanged_threshold: max mean gray level difference to consider screenshots equal
+        """
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.quality = quality
+        self.clip = clip
+        self.scale = scale
+        self.skip_unchanged = skip_unchanged
+        self.unchanged_threshold = unchanged_threshold
+
+        # Decoding, hashing and writing happen off the crawl thread
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.pending = []
+        self.pre_consent_thumbnail = None
+
+    @property
+    def extension(self):
+        return SCREENSHOT_FORMATS[self.image_format]
+
+    def _capture_params(self, driver):
+        """
+        Build the parameters for the CDP Page.captureScreenshot command.
+        :param driver: the Chrome driver to capture the screenshot with
+        :return: the command parameters
+        """
+        params = {"format": self.image_format}
+
+        if self.quality is not None and self.image_format != "png":
+            params["quality"] = self.quality
+
+        if self.clip is not None or self.scale != 1:
+            if self.clip is not None:
+                x, y, width, height = self.clip
+            else:
+                viewport = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})[
+                    "cssLayoutViewport"
+                ]
+                x, y = viewport["pageX"], viewport["pageY"]
+                width, height = viewport["clientWidth"], viewport["clientHeight"]
+            params["clip"] = {
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+                "scale": self.scale,
+            }
+
+        return params
+
+    def capture(self, driver, filename, post_consent=False):
+        """
+        Capture a screenshot and hand it off to be saved.
+        :param driver: the Chrome driver to capture the screenshot with
+        :param filename: the file name (without extension) to save the screenshot as
+        :param post_consent: Pre or post accepting cookies
+        """
+        start_time = time.perf_counter()
+        result = driver.execute_cdp_cmd(
+            "Page.captureScreenshot", self._capture_params(driver)
+        )
+        capture_time = time.perf_counter() - start_time
+
+        self.pending.append(
+            self.executor.submit(
+                self._process,
+                result["data"],
+                f"{filename}.{self.extension}",
+                post_consent,
+                capture_time,
+            )
+        )
+
+    def _process(self, image_base64, filename, post_consent, capture_time):
+        """
+        Decode a captured screenshot and save it, unless it is unchanged since pre consent.
+        :return: statistics about the screenshot
+        """
+        image_data = base64.b64decode(image_base64)
+        output = {
+            "screenshot": filename,
+            "post_consent": post_consent,
+            "capture_time": capture_time,
+            "bytes": len(image_data),
+            "skipped_unchanged": False,
+        }
+
+        if self.skip_unchanged:
+            try:
+                thumbnail = grayscale_thumbnail(image_data)
+            except Exception as e:
+                logging.warning(f"Could not compare screenshot {filename}: {e}")
+                thumbnail = None
+
+            if not post_consent:
+                self.pre_consent_thumbnail = thumbnail
+            elif (
+                thumbnail is not None
+                and self.pre_consent_thumbnail is not None
+                and mean_pixel_difference(thumbnail, self.pre_consent_thumbnail)
+                <= self.unchanged_threshold
+            ):
+                logging.info(
+                    f"Post consent screenshot {filename} unchanged, not saving it"
+                )
+                output["screenshot"] = None
+                output["skipped_unchanged"] = True
+                return output
+
+        with open(path.join(self.output_dir, filename), "wb") as file:
+            file.write(image_data)
+
+        return output
+
+    def collect(self):
+        """
+        Wait for all pending screenshots to be saved.
+        :return: statistics of the screenshots taken since the last collect
+        """
+        output = []
+        for future in self.pending:
+            try:
+                output.append(future.result())
+            except Exception as e:
+                logging.warning(f"Processing screenshot failed. Exception: {e}")
+        self.pending = []
+        self.pre_consent_thumbnail = None
+        return output
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)